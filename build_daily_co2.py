@@ -0,0 +1,29 @@
+import pandas as pd
+
+from dashboard_core import DAILY_CO2_PATH, FILE_PATH
+
+
+# --- Preprocessing ----------------------------------------------------------
+def build_daily_co2(csv_path: str = FILE_PATH, parquet_path: str = DAILY_CO2_PATH) -> pd.DataFrame:
+    # Run once whenever the CSV changes; the dashboard only reads the result
+    df = pd.read_csv(
+        csv_path,
+        names=["region", "date", "sector", "co2_mt"],
+        engine="pyarrow",
+        dtype_backend="pyarrow",
+        dtype={"co2_mt": "float64"},
+    )
+    s = df["date"].astype(str)
+    d1 = pd.to_datetime(s, format="%m/%d/%Y", errors="coerce", cache=True)
+    d2 = pd.to_datetime(s, format="%d/%m/%Y", errors="coerce", cache=True)
+    df["date"] = d1.combine_first(d2)
+    df = df.dropna(subset=["date"])
+
+    daily = df.groupby("date")[["co2_mt"]].sum()
+    daily.to_parquet(parquet_path, engine="pyarrow", compression="snappy")
+    return daily
+
+
+if __name__ == "__main__":
+    daily = build_daily_co2()
+    print(f"Wrote {len(daily)} days to {DAILY_CO2_PATH}")
@@ -0,0 +1,263 @@
+import streamlit as st
+from datetime import date, datetime
+from zoneinfo import ZoneInfo  # Python 3.9+
+import pandas as pd
+import numpy as np
+import base64
+import math
+import os
+
+# --- constants --------------------------------------------------------------
+SECONDS_PER_DAY = 24 * 60 * 60  # 86,400 seconds in a day
+UPDATE_INTERVAL_SEC = 2  # update frequency (seconds)
+TZ = ZoneInfo("America/Los_Angeles")
+
+FILE_PATH = "carbon-monitor-carbonmonitorGLOBAL-WORLD(datas).csv"
+DAILY_CO2_PATH = "daily_co2.parquet"
+
+TOTAL_DAILY_HA = 437.16
+HA_PER_SECOND = TOTAL_DAILY_HA / SECONDS_PER_DAY
+
+TOTAL_DAILY_PLASTIC_KG = 1_260_273_973 # Kept as per original code, though not used in display
+PLASTIC_KG_PER_SECOND = TOTAL_DAILY_PLASTIC_KG / SECONDS_PER_DAY # Kept as per original code
+
+TOTAL_DAILY_OCEAN_PLASTIC_KG = 30_136_986 # Kept as per original code
+OCEAN_PLASTIC_KG_PER_SECOND = TOTAL_DAILY_OCEAN_PLASTIC_KG / SECONDS_PER_DAY # Kept as per original code
+
+TOTAL_DAILY_MICROPLASTIC_MG = 714.0 # Kept as per original code
+MICROPLASTIC_MG_PER_SECOND = TOTAL_DAILY_MICROPLASTIC_MG / SECONDS_PER_DAY # Kept as per original code
+
+TOTAL_DAILY_ACRES_LOST = 202_513
+ACRES_PER_SECOND = TOTAL_DAILY_ACRES_LOST / SECONDS_PER_DAY
+HA_PER_ACRE = 0.404686
+FOOTBALL_FIELD_ACRES = 1.32
+CREDIT_CARD_MICROPLASTIC_MG = 5000
+
+ITALY_2023_ANNUAL_CO2_MILLION_METRIC_TONS = 312.67
+ITALY_2023_ANNUAL_CO2_METRIC_TONS = ITALY_2023_ANNUAL_CO2_MILLION_METRIC_TONS * 1_000_000
+ITALY_2023_DAILY_CO2_METRIC_TONS = int(ITALY_2023_ANNUAL_CO2_METRIC_TONS / 365)
+
+# Weight of the Great Pyramid of Giza in metric tons (approximate)
+GREAT_PYRAMID_WEIGHT_METRIC_TONS = 5_750_000
+
+# Area of the White House and its grounds in hectares (approximate, from search)
+WHITE_HOUSE_AREA_HA = 7.3
+
+# Per-second rates and their comparison units, evaluated together each tick:
+# [hectares, plastic kg, ocean plastic kg, microplastic mg, acres]
+RATES_PER_SECOND = np.array([
+    HA_PER_SECOND,
+    PLASTIC_KG_PER_SECOND,
+    OCEAN_PLASTIC_KG_PER_SECOND,
+    MICROPLASTIC_MG_PER_SECOND,
+    ACRES_PER_SECOND,
+])
+COMPARISON_DIVISORS = np.array([
+    WHITE_HOUSE_AREA_HA,
+    1.0,  # plastic produced has no comparison
+    1.0,  # ocean plastic has no comparison
+    CREDIT_CARD_MICROPLASTIC_MG,
+    FOOTBALL_FIELD_ACRES,
+])
+
+
+# --- Font Loader ------------------------------------------------------------
+@st.cache_resource
+def load_woff_font_base64(path):
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
+@st.cache_resource
+def load_font_css(path):
+    # Build the full <style> block once per process rather than on every rerun
+    qartella_font = load_woff_font_base64(path)
+    return f"""
+        <style>
+        @font-face {{
+            font-family: 'Qartella';
+            src: url(data:font/woff;base64,{qartella_font}) format('woff');
+            font-weight: normal;
+            font-style: normal;
+        }}
+
+        /* Apply Qartella font globally */
+        html, body, [class*="st-"] {{
+            font-family: 'Qartella', sans-serif !important;
+        }}
+
+        .stApp {{
+            background-color: #0E1117;
+            color: white;
+        }}
+
+        /* Three equal metric columns; padding and gap stand in for the old spacer columns */
+        .metric-grid {{
+            display: grid;
+            grid-template-columns: repeat(3, 1fr);
+            gap: 2em;
+            padding: 0 12%;
+        }}
+
+        .metric-block {{
+            margin-bottom: 0px; /* Remove default margin below text block */
+            text-align: center; /* Center the text within the metric block */
+        }}
+        .metric-label {{
+            color: white;
+            font-size: 1.5em;
+            margin-bottom: 5px;
+        }}
+        .metric-value {{
+            color: white;
+            font-size: 3em;
+            font-weight: bold;
+            margin-bottom: 5px;
+        }}
+        .metric-comparison {{
+            color: #70c38B;
+            font-size: 1.8em;
+            margin-top: 0px;
+            white-space: nowrap;  /* Prevent line breaks */
+            overflow: hidden; /* Hide overflow if nowrap causes it to go beyond container */
+            text-overflow: ellipsis; /* Add ellipsis for overflowed text */
+        }}
+        /* Adjusted .bottom-left for relative positioning and spacing */
+        .bottom-left {{
+            font-size: 1.1em; /* REDUCED FONT SIZE HERE */
+            font-weight: bold;
+            margin-top: 60px; /* Space above running time */
+            text-align: center; /* Center the running time text */
+            width: 100%; /* Ensure it takes full width for centering */
+        }}
+        /* Center each image in its grid track and pull it up towards the text */
+        .metric-image {{
+            justify-self: center; /* Center horizontally */
+            align-self: start; /* Align to the top of the grid row */
+            max-width: 100%; /* Shrink with the track on narrow screens */
+            height: auto;
+            margin-top: -20px; /* Adjust this value to pull the image up closer to the text. Experiment! */
+            margin-bottom: 0px; /* Ensure no extra space below the image */
+        }}
+        </style>
+    """
+
+
+# Fallback CSS if the font is not found (simplified for brevity)
+FALLBACK_CSS = """
+        <style>
+        .stApp { background-color: #0E1117; color: white; }
+        .metric-grid { display: grid; grid-template-columns: repeat(3, 1fr); gap: 2em; padding: 0 12%; }
+        .metric-block { margin-bottom: 0px; text-align: center; }
+        .metric-label { color: white; font-size: 1.5em; margin-bottom: 5px; }
+        .metric-value { color: white; font-size: 3em; font-weight: bold; margin-bottom: 5px; }
+        .metric-comparison { white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+        .bottom-left {
+            font-size: 1.1em; /* REDUCED FONT SIZE HERE */
+            font-weight: bold;
+            margin-top: 60px;
+            text-align: center;
+            width: 100%;
+        }
+        .metric-image {
+            justify-self: center;
+            align-self: start;
+            max-width: 100%;
+            height: auto;
+            margin-top: -20px;
+            margin-bottom: 0px;
+        }
+        </style>
+    """
+
+
+# --- Image Loader ----------------------------------------------------------
+@st.cache_resource
+def img_data_uri(path):
+    with open(path, "rb") as f:
+        return "data:image/png;base64," + base64.b64encode(f.read()).decode()
+
+
+# --- Helper Functions ------------------------------------------------------
+def todays_midnight(now: datetime) -> datetime:
+    # Midnight only changes once a day, so keep it in session state between ticks
+    midnight = st.session_state.get("midnight")
+    if midnight is None or midnight.date() != now.date():
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        st.session_state.midnight = midnight
+    return midnight
+
+def dataset_date(now: datetime) -> date:
+    # The emissions data only covers 2024, so look up today's calendar day in that year
+    return now.date().replace(year=2024)
+
+def time_elapsed_seconds(now: datetime) -> float:
+    midnight = todays_midnight(now)
+    return max(0, min((now - midnight).total_seconds(), SECONDS_PER_DAY))
+
+# (divisor, format) per power of 1,000; the suffix is part of the format
+K_FORMAT_TIERS = (
+    (1, "{:,.0f}"),
+    (1_000, "{:.0f}k"),
+    (1_000_000, "{:.1f}M"),
+    (1_000_000_000, "{:.1f}B"),
+)
+
+def k_format(val: float) -> str:
+    idx = min(int(math.log10(max(val, 1)) // 3), len(K_FORMAT_TIERS) - 1)
+    divisor, fmt = K_FORMAT_TIERS[idx]
+    return fmt.format(val / divisor)
+
+def date_strings(day: date) -> set[str]:
+    # Every spelling of `day` that build_daily_co2.py would parse back to it:
+    # month-first always wins, so day-first only applies when the day can't be a month
+    candidates = {f"{day.month}/{day.day}/{day.year}", f"{day.month:02d}/{day.day:02d}/{day.year}"}
+    if day.day > 12:
+        candidates |= {f"{day.day}/{day.month}/{day.year}", f"{day.day:02d}/{day.month:02d}/{day.year}"}
+    return candidates
+
+def load_total_today_emissions_csv(today_2024: date) -> float:
+    # Fallback when daily_co2.parquet hasn't been built: match today's rows by
+    # their raw date string so nothing in the CSV needs parsing
+    df = pd.read_csv(
+        FILE_PATH,
+        names=["region", "date", "sector", "co2_mt"],
+        engine="pyarrow",
+        dtype_backend="pyarrow",
+        dtype={"date": "string", "co2_mt": "float64"},
+    )
+    mask = df["date"].isin(date_strings(today_2024))
+    return df.loc[mask, "co2_mt"].sum() * 1_000_000
+
+@st.cache_resource
+def load_daily_co2_lookup(data_version: float) -> dict[date, float]:
+    # Shared by reference across every session, so the file is read once per
+    # process and again only when data_version says it was rebuilt
+    # daily_co2.parquet is produced by build_daily_co2.py
+    daily = pd.read_parquet(DAILY_CO2_PATH, columns=["co2_mt"], engine="pyarrow", memory_map=True)
+    return dict(zip(daily.index.date, daily["co2_mt"]))
+
+def emissions_data_version() -> float:
+    # Modification time of whichever source load_total_today_emissions reads,
+    # so rebuilding daily_co2.parquet (or editing the CSV) invalidates the caches
+    if os.path.exists(DAILY_CO2_PATH):
+        return os.path.getmtime(DAILY_CO2_PATH)
+    return os.path.getmtime(FILE_PATH)
+
+def load_total_today_emissions(today_2024: date, data_version: float) -> float:
+    if not os.path.exists(DAILY_CO2_PATH):
+        return load_total_today_emissions_csv(today_2024)
+    return load_daily_co2_lookup(data_version).get(today_2024, 0.0) * 1_000_000
+
+def emissions_so_far(elapsed: float, total_today: float) -> float:
+    return total_today * (elapsed / SECONDS_PER_DAY)
+
+
+# --- Cached Data -----------------------------------------------------------
+# Persisted to disk so restarts skip the load; disk caches ignore ttl,
+# so the date argument is what rolls the cached value over at midnight and
+# data_version is what drops it when the source file is rebuilt.
+# Errors are left to the caller: Streamlit doesn't cache exceptions, so a
+# failed load is retried on the next tick instead of being persisted.
+@st.cache_data(persist="disk")
+def get_emissions_total(today_2024: date, data_version: float):
+    return load_total_today_emissions(today_2024, data_version)